@@ -1,15 +1,16 @@
+import asyncio
+import html
 import http.client
+import http.cookiejar
 import logging
 import os
 import random
 import re
 import socket
 import ssl
-import threading
 import time
 import webbrowser
 from datetime import datetime, timedelta
-from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Dict, Optional, Union
 from urllib.parse import parse_qs, quote, urlparse
@@ -37,6 +38,37 @@ SANDBOX_LOGIN_URL = (
 PROD_LOGIN_URL = os.environ.get("SF_PROD_LOGIN_URL") or "https://login.salesforce.com"
 PORT_IN_USE_ERR = "Cannot listen for callback, as port {} is already in use."
 DEVICE_GRANT_TYPE = "urn:ietf:params:oauth:grant-type:device_code"
+SUCCESS_EMOJIS = ("🎉", "👍", "👍🏿", "🥳", "🎈")
+# Don't let an idle connection (e.g. a Safari preconnect) hang around
+# waiting for a request line.
+# https://github.com/SFDO-Tooling/CumulusCI/pull/2373
+CALLBACK_READ_TIMEOUT = 3
+# (connect, read) timeout for requests to the token endpoint
+TOKEN_REQUEST_TIMEOUT = (5, 30)
+
+
+def _new_token_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    # The session is shared across orgs, so don't let cookies from one
+    # token endpoint ride along on requests made for another.
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# Shared by every OAuth2Client so that repeated token requests (e.g. each
+# access token refresh) reuse one pooled keep-alive connection.
+_token_session = _new_token_session()
+
+
+def _reset_token_session():
+    global _token_session
+    _token_session = _new_token_session()
+
+
+if hasattr(os, "register_at_fork"):
+    # don't share pooled sockets with forked child processes
+    os.register_at_fork(after_in_child=_reset_token_session)
 
 
 def create_key_and_self_signed_cert():
@@ -107,8 +139,18 @@ class OAuth2Client(object):
             client_config = OAuth2ClientConfig(**client_config)
         self.client_config = client_config
         self.response = None
-        self.httpd = None
+        self.callback_socket = None
         self.httpd_timeout = 300
+        # client credentials sent with every token request
+        self._token_data_template = {
+            "client_id": client_config.client_id,
+            "client_secret": client_config.client_secret,
+        }
+
+    @property
+    def session(self) -> requests.Session:
+        """The session shared by all clients for token requests"""
+        return _token_session
 
     def auth_code_flow(self, **kwargs) -> dict:
         """Completes the flow for the OAuth2 auth code grant type.
@@ -128,41 +170,36 @@ class OAuth2Client(object):
         """
         assert self.client_config.redirect_uri
         auth_uri_with_params = self._get_auth_uri(**kwargs)
-        # Open up an http daemon to listen for the
+        # Open up a socket to listen for the
         # callback from the auth server
-        self.httpd = self._create_httpd()
+        self.callback_socket = self._create_callback_socket()
         logger.info(
             f"Spawning HTTP server at {self.client_config.redirect_uri}"
-            f" with timeout of {self.httpd.timeout} seconds.\n"
+            f" with timeout of {self.httpd_timeout} seconds.\n"
             "If you are unable to log in to Salesforce you can"
             " press <Ctrl+C> to kill the server and return to the command line."
         )
         # Open a browser and direct the user to login
         webbrowser.open(auth_uri_with_params, new=1)
-        # Implement the 300 second timeout
-        timeout_thread = HTTPDTimeout(self.httpd, self.httpd_timeout)
-        timeout_thread.start()
-        # use serve_forever because it is smarter about polling for Ctrl-C
-        # on Windows.
-        #
-        # There are two ways it can be shutdown.
-        # 1. Get a callback from Salesforce.
-        # 2. Timeout
-
-        old_timeout = socket.getdefaulttimeout()
+        # Serve until we get a callback from Salesforce
+        # or hit the 300 second timeout.
         try:
-            # for some reason this is required for Safari (checked Feb 2021)
-            # https://github.com/SFDO-Tooling/CumulusCI/pull/2373
-            socket.setdefaulttimeout(3)
-            self.httpd.serve_forever()
+            asyncio.run(
+                asyncio.wait_for(
+                    self._serve_until_callback(
+                        self.callback_socket, self._get_ssl_context()
+                    ),
+                    timeout=self.httpd_timeout,
+                )
+            )
+        except asyncio.TimeoutError:
+            pass
         finally:
-            socket.setdefaulttimeout(old_timeout)
+            self.callback_socket.close()
             if self.client_config.redirect_uri.startswith("https:"):
                 Path("key.pem").unlink()
                 Path("localhost.pem").unlink()
 
-        # timeout thread can stop polling and just finish
-        timeout_thread.quit()
         self.validate_response(self.response)
         return safe_json_from_response(self.response)
 
@@ -177,38 +214,141 @@ class OAuth2Client(object):
             url += f"&{k}={quote(v)}"
         return url
 
-    def _create_httpd(self):
-        """Create an http daemon process to listen
-        for the callback from the auth server"""
+    def _create_callback_socket(self) -> socket.socket:
+        """Create a socket to listen for
+        the callback from the auth server"""
         url_parts = urlparse(self.client_config.redirect_uri)
-        use_https = url_parts.scheme == "https"
-        hostname = url_parts.hostname
-        port = url_parts.port
-
-        server_address = (hostname, port)
-        OAuthCallbackHandler.parent = self
+        server_address = (url_parts.hostname, url_parts.port)
 
         try:
-            httpd = HTTPServer(server_address, OAuthCallbackHandler)
+            return socket.create_server(server_address)
         except OSError as e:
             if self._address_in_use_error(e):
-                raise OAuth2Error(PORT_IN_USE_ERR.format(port))
+                raise OAuth2Error(PORT_IN_USE_ERR.format(url_parts.port))
             else:
                 raise
 
-        if use_https:
-            if not Path("localhost.pem").is_file() or not Path("key.pem").is_file():
-                create_key_and_self_signed_cert()
-            httpd.socket = ssl.wrap_socket(
-                httpd.socket,
-                server_side=True,
-                certfile="localhost.pem",
-                keyfile="key.pem",
-                ssl_version=ssl.PROTOCOL_TLS,
+    def _get_ssl_context(self) -> Optional[ssl.SSLContext]:
+        """Returns a server-side SSL context with a self-signed
+        certificate if the redirect_uri uses https"""
+        if not self.client_config.redirect_uri.startswith("https:"):
+            return None
+        if not Path("localhost.pem").is_file() or not Path("key.pem").is_file():
+            create_key_and_self_signed_cert()
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(certfile="localhost.pem", keyfile="key.pem")
+        return ssl_context
+
+    async def _serve_until_callback(
+        self, sock: socket.socket, ssl_context: Optional[ssl.SSLContext]
+    ):
+        """Accept connections on sock until one of them is the
+        callback from the auth server"""
+        callback_received = asyncio.Event()
+        callback_error = None
+
+        async def handle_connection(reader, writer):
+            nonlocal callback_error
+            try:
+                if await self._handle_connection(reader, writer):
+                    callback_received.set()
+            except Exception as e:
+                # hand the error to auth_code_flow rather than
+                # waiting for the timeout
+                callback_error = e
+                callback_received.set()
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(
+            handle_connection, sock=sock, ssl=ssl_context
+        )
+        async with server:
+            await callback_received.wait()
+        if callback_error:
+            raise callback_error
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Read one HTTP request and respond to it.
+        Returns True if it was the callback from the auth server."""
+        try:
+            request = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), timeout=CALLBACK_READ_TIMEOUT
             )
-
-        httpd.timeout = self.httpd_timeout
-        return httpd
+        except (
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            OSError,
+        ):
+            return False
+
+        request_line = request.split(b"\r\n", 1)[0].decode("latin-1")
+        # e.g. "GET /callback?code=123 HTTP/1.1"
+        parts = request_line.split(" ")
+        path = parts[1] if len(parts) > 1 else ""
+        args = parse_qs(path.partition("?")[2], keep_blank_values=True)
+        is_callback = "error" in args or "code" in args
+        callback_error = None
+        if is_callback:
+            try:
+                # the token exchange blocks, so keep it off the event loop
+                (
+                    http_status,
+                    http_body,
+                ) = await asyncio.get_running_loop().run_in_executor(
+                    None, self._handle_callback, args
+                )
+            except Exception as e:
+                callback_error = e
+                http_status = http.client.INTERNAL_SERVER_ERROR
+                http_body = f"Authentication failed: {html.escape(repr(e))}"
+        else:
+            http_status, http_body = http.client.NOT_FOUND, ""
+
+        body = http_body.encode("utf-8")
+        reason = http.client.responses.get(http_status, "")
+        headers = (
+            f"HTTP/1.0 {http_status} {reason}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+        )
+        writer.write(headers.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except OSError:
+            pass
+        if callback_error:
+            raise callback_error
+        return is_callback
+
+    def _handle_callback(self, args: Dict[str, list]):
+        """Record the auth server's callback in self.response and
+        return the HTTP status and body to show the user."""
+        if "error" in args:
+            http_status = http.client.BAD_REQUEST
+            http_body = f"error: {args['error'][0]}\nerror description: {args.get('error_description', [''])[0]}"
+            response = requests.Response()
+            response.status_code = http_status
+            response._content = http_body.encode("utf-8")
+            response.encoding = "utf-8"
+            self.response = response
+        else:
+            http_status = http.client.OK
+            emoji = random.choice(SUCCESS_EMOJIS)
+            http_body = f"""<html>
+            <h1 style="font-size: large">{emoji}</h1>
+            <p>Congratulations! Your authentication succeeded.</p>"""
+            auth_code = args["code"]
+            self.response = self.auth_code_grant(auth_code)
+            if self.response.status_code >= http.client.BAD_REQUEST:
+                http_status = self.response.status_code
+                http_body = self.response.text
+        return http_status, http_body
 
     def _address_in_use_error(self, error: Exception):
         """Returns true if the error is caused by an 'address already in use'.
@@ -220,25 +360,23 @@ class OAuth2Client(object):
     def auth_code_grant(self, auth_code):
         """Exchange an auth code for an access token"""
         data = {
-            "client_id": self.client_config.client_id,
-            "client_secret": self.client_config.client_secret,
+            **self._token_data_template,
             "grant_type": "authorization_code",
             "redirect_uri": self.client_config.redirect_uri,
             "code": auth_code,
         }
-        return requests.post(
-            self.client_config.token_uri, headers=HTTP_HEADERS, data=data
+        return self.session.post(
+            self.client_config.token_uri, data=data, timeout=TOKEN_REQUEST_TIMEOUT
         )
 
     def refresh_token(self, refresh_token):
         data = {
-            "client_id": self.client_config.client_id,
-            "client_secret": self.client_config.client_secret,
+            **self._token_data_template,
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
         }
-        response = requests.post(
-            self.client_config.token_uri, headers=HTTP_HEADERS, data=data
+        response = self.session.post(
+            self.client_config.token_uri, data=data, timeout=TOKEN_REQUEST_TIMEOUT
         )
         self.validate_response(response)
         return safe_json_from_response(response)
@@ -254,71 +392,6 @@ class OAuth2Client(object):
         )
 
 
-class HTTPDTimeout(threading.Thread):
-    """Establishes a timeout for a SimpleHTTPServer"""
-
-    # allow the process to quit even if the
-    # timeout thread is still alive
-    daemon = True
-
-    def __init__(self, httpd, timeout):
-        self.httpd = httpd
-        self.timeout = timeout
-        super().__init__()
-
-    def run(self):
-        """Check every second for HTTPD or quit after timeout"""
-        target_time = time.time() + self.timeout
-        while time.time() < target_time:
-            time.sleep(1)
-            if not self.httpd:
-                break
-
-        # extremely minor race condition
-        if self.httpd:  # pragma: no cover
-            self.httpd.shutdown()
-
-    def quit(self):
-        """Quit before timeout"""
-        self.httpd = None
-
-
-class OAuthCallbackHandler(BaseHTTPRequestHandler):
-    parent: Optional[OAuth2Client] = None
-
-    def do_GET(self):
-        args = parse_qs(urlparse(self.path).query, keep_blank_values=True)
-
-        if "error" in args:
-            http_status = http.client.BAD_REQUEST
-            http_body = f"error: {args['error'][0]}\nerror description: {args['error_description'][0]}"
-        else:
-            http_status = http.client.OK
-            emoji = random.choice(["🎉", "👍", "👍🏿", "🥳", "🎈"])
-            http_body = f"""<html>
-            <h1 style="font-size: large">{emoji}</h1>
-            <p>Congratulations! Your authentication succeeded.</p>"""
-            auth_code = args["code"]
-            self.parent.response = self.parent.auth_code_grant(auth_code)
-            if self.parent.response.status_code >= http.client.BAD_REQUEST:
-                http_status = self.parent.response.status_code
-                http_body = self.parent.response.text
-        self.send_response(http_status)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-
-        self.end_headers()
-        self.wfile.write(http_body.encode("utf-8"))
-        if self.parent.response is None:
-            response = requests.Response()
-            response.status_code = http_status
-            response._content = http_body
-            self.parent.response = response
-
-        #  https://docs.python.org/3/library/socketserver.html#socketserver.BaseServer.shutdown
-        # shutdown() must be called while serve_forever() is running in a different thread otherwise it will deadlock.
-        threading.Thread(target=self.server.shutdown).start()
-
-
 def get_device_code(config: OAuth2ClientConfig) -> dict:
     """Initiates the flow for the OAuth2 device authorization grant type.
     For more info on the auth code flow see:
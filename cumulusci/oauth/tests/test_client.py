@@ -1,4 +1,5 @@
 import http.client
+import socket
 import ssl
 import sys
 import threading
@@ -10,13 +11,18 @@ from contextlib import contextmanager
 from unittest import mock
 
 import pytest
+import requests
 import responses
 from requests.models import Response
 
-from cumulusci.core.exceptions import SalesforceCredentialsException
+from cumulusci.core.exceptions import (
+    CumulusCIUsageError,
+    SalesforceCredentialsException,
+)
 from cumulusci.core.keychain.base_project_keychain import DEFAULT_CONNECTED_APP_PORT
 from cumulusci.oauth.client import (
     PORT_IN_USE_ERR,
+    TOKEN_REQUEST_TIMEOUT,
     OAuth2Client,
     OAuth2ClientConfig,
     OAuth2DeviceConfig,
@@ -73,22 +79,28 @@ def http_client(client_config):
 @contextmanager
 @mock.patch("time.sleep", time.sleep)  # undo mock from conftest
 def httpd_thread(oauth_client):
-    # call OAuth object on another thread - this spawns local httpd
+    # call OAuth object on another thread - this spawns local callback server
     thread = threading.Thread(target=oauth_client.auth_code_flow)
     thread.start()
     while thread.is_alive():
-        if oauth_client.httpd:
+        if oauth_client.callback_socket:
             break
         time.sleep(0.01)
 
     assert (
-        oauth_client.httpd
+        oauth_client.callback_socket
     ), "HTTPD did not start. Perhaps port 8080 cannot be accessed."
 
     try:
         yield oauth_client
     finally:
-        oauth_client.httpd.shutdown()
+        if oauth_client.response is None:
+            # the test didn't send a callback; send an error one to end the flow
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(
+                    oauth_client.client_config.redirect_uri
+                    + "?error=cancelled&error_description=test"
+                )
         thread.join()
 
 
@@ -104,6 +116,62 @@ class TestOAuth2Client:
         info = client.refresh_token("token")
         assert info["message"] == "SENTINEL"
 
+    @responses.activate
+    def test_refresh_token__reuses_session(self, client):
+        responses.add(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            body=b'{"message":"SENTINEL"}',
+        )
+        with mock.patch.object(
+            client.session, "post", wraps=client.session.post
+        ) as post:
+            client.refresh_token("token")
+            client.refresh_token("token")
+        assert post.call_count == 2
+        assert (
+            responses.calls[0].request.headers["Content-Type"]
+            == "application/x-www-form-urlencoded"
+        )
+
+    @responses.activate
+    def test_auth_code_grant__timeout(self, client):
+        responses.add(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            body=b"{}",
+        )
+        with mock.patch.object(
+            client.session, "post", wraps=client.session.post
+        ) as post:
+            client.auth_code_grant("123")
+        assert post.call_args.kwargs["timeout"] == TOKEN_REQUEST_TIMEOUT
+        assert urllib.parse.parse_qs(responses.calls[0].request.body) == {
+            "client_id": ["foo_id"],
+            "client_secret": ["foo_secret"],
+            "grant_type": ["authorization_code"],
+            "redirect_uri": ["http://localhost:7788/callback"],
+            "code": ["123"],
+        }
+
+    def test_session__shared_between_clients(self, client_config):
+        assert (
+            OAuth2Client(client_config).session is OAuth2Client(client_config).session
+        )
+
+    @responses.activate
+    def test_session__does_not_keep_cookies(self, client_config):
+        responses.add(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            body=b"{}",
+            headers={"Set-Cookie": "BrowserId=abc; Path=/"},
+        )
+        OAuth2Client(client_config).refresh_token("token")
+        OAuth2Client(client_config).refresh_token("token")
+        assert "Cookie" not in responses.calls[1].request.headers
+        assert not OAuth2Client(client_config).session.cookies
+
     @responses.activate
     def test_auth_code_flow___http(self, http_client):
         expected_response = {
@@ -124,7 +192,7 @@ class TestOAuth2Client:
             json=expected_response,
         )
 
-        # call OAuth object on another thread - this spawns local httpd
+        # call OAuth object on another thread - this spawns local callback server
         with httpd_thread(http_client) as oauth_client:
             # simulate callback from browser
             response = urllib.request.urlopen(
@@ -159,7 +227,7 @@ class TestOAuth2Client:
         # https://stackoverflow.com/questions/49183801/ssl-certificate-verify-failed-with-urllib
         ssl._create_default_https_context = ssl._create_unverified_context
 
-        # call OAuth object on another thread - this spawns local httpd
+        # call OAuth object on another thread - this spawns local callback server
         with httpd_thread(client) as oauth_client:
             # simulate callback from browser
             response = urllib.request.urlopen(
@@ -190,7 +258,7 @@ class TestOAuth2Client:
             json=expected_response,
         )
 
-        # call OAuth object on another thread - this spawns local httpd
+        # call OAuth object on another thread - this spawns local callback server
         with httpd_thread(client):
             # simulate callback from browser
             with pytest.raises(urllib.error.HTTPError):
@@ -199,22 +267,26 @@ class TestOAuth2Client:
                     + "?error=123&error_description=broken"
                 )
 
+        assert client.response.status_code == http.client.BAD_REQUEST
+        assert client.response.content == b"error: 123\nerror description: broken"
+        assert client.response.text == "error: 123\nerror description: broken"
+
     @pytest.mark.skipif(
         sys.platform.startswith("win"), reason="setup differs from windows"
     )
-    def test_create_httpd__port_already_in_use(self, client):
+    def test_create_callback_socket__port_already_in_use(self, client):
         with httpd_thread(client):
             with pytest.raises(
                 OAuth2Error, match=PORT_IN_USE_ERR.format(DEFAULT_CONNECTED_APP_PORT)
             ):
-                client._create_httpd()
+                client._create_callback_socket()
 
-    @mock.patch("cumulusci.oauth.client.HTTPServer")
-    def test_create_httpd__other_OSError(self, HTTPServer, client):
+    @mock.patch("cumulusci.oauth.client.socket.create_server")
+    def test_create_callback_socket__other_OSError(self, create_server, client):
         message = "generic error message"
-        HTTPServer.side_effect = OSError(message)
+        create_server.side_effect = OSError(message)
         with pytest.raises(OSError, match=message):
-            client._create_httpd()
+            client._create_callback_socket()
 
     @responses.activate
     def test_oauth_flow_error_from_token(self, client):
@@ -225,12 +297,113 @@ class TestOAuth2Client:
             status=http.client.FORBIDDEN,
         )
 
-        # call OAuth object on another thread - this spawns local httpd
+        # call OAuth object on another thread - this spawns local callback server
         with httpd_thread(client):
             # simulate callback from browser
             with pytest.raises(urllib.error.HTTPError):
                 urllib.request.urlopen(client.client_config.redirect_uri + "?code=123")
 
+    def test_auth_code_flow__timeout(self, http_client):
+        http_client.httpd_timeout = 0.05
+        with pytest.raises(CumulusCIUsageError, match="timed out"):
+            http_client.auth_code_flow()
+        assert http_client.callback_socket.fileno() == -1
+
+    @responses.activate
+    def test_auth_code_flow__ignores_non_callback_requests(self, http_client):
+        responses.add(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            status=http.client.OK,
+            json={"access_token": "abc123"},
+        )
+        with httpd_thread(http_client) as oauth_client:
+            # e.g. a favicon request or an idle preconnect
+            with pytest.raises(urllib.error.HTTPError) as e:
+                urllib.request.urlopen("http://localhost:8080/favicon.ico")
+            assert e.value.code == http.client.NOT_FOUND
+            with socket.create_connection(("localhost", 8080)):
+                assert oauth_client.response is None
+                urllib.request.urlopen(
+                    oauth_client.client_config.redirect_uri + "?code=123"
+                )
+
+        assert oauth_client.response.json() == {"access_token": "abc123"}
+
+    @responses.activate
+    def test_auth_code_flow__token_exchange_does_not_block_server(self, http_client):
+        release_token = threading.Event()
+
+        def slow_token_response(request):
+            release_token.wait(5)
+            return (http.client.OK, {}, '{"access_token": "abc123"}')
+
+        responses.add_callback(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            callback=slow_token_response,
+        )
+        with httpd_thread(http_client) as oauth_client:
+            callback = threading.Thread(
+                target=urllib.request.urlopen,
+                args=(oauth_client.client_config.redirect_uri + "?code=123",),
+            )
+            callback.start()
+            # served while the token exchange is still in progress
+            with pytest.raises(urllib.error.HTTPError) as e:
+                urllib.request.urlopen("http://localhost:8080/favicon.ico", timeout=2)
+            assert e.value.code == http.client.NOT_FOUND
+            release_token.set()
+            callback.join()
+
+        assert oauth_client.response.json() == {"access_token": "abc123"}
+
+    @pytest.mark.parametrize(
+        "query,token_response,http_status,error",
+        [
+            # missing error_description
+            ("?error=123", {}, http.client.BAD_REQUEST, OAuth2Error),
+            # token request fails
+            (
+                "?code=123",
+                {"body": requests.ConnectionError("no route")},
+                http.client.INTERNAL_SERVER_ERROR,
+                requests.ConnectionError,
+            ),
+            # status code that http.client doesn't know
+            ("?code=123", {"status": 520, "body": "oops"}, 520, OAuth2Error),
+        ],
+    )
+    @responses.activate
+    @mock.patch("time.sleep", time.sleep)  # undo mock from conftest
+    def test_auth_code_flow__callback_error_is_raised(
+        self, http_client, query, token_response, http_status, error
+    ):
+        responses.add(
+            responses.POST,
+            "https://login.salesforce.com/services/oauth2/token",
+            **token_response,
+        )
+        errors = []
+
+        def run_flow():
+            try:
+                http_client.auth_code_flow()
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run_flow)
+        thread.start()
+        while thread.is_alive() and not http_client.callback_socket:
+            time.sleep(0.01)
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(http_client.client_config.redirect_uri + query)
+        assert e.value.code == http_status
+        thread.join(5)
+        assert not thread.is_alive()
+        assert isinstance(errors[0], error)
+
     def test_validate_response__raises_error(self, client):
         response = Response()
         response.status_code = 400
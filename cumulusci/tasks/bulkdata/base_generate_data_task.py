@@ -1,13 +1,14 @@
 import os
 from abc import ABCMeta, abstractmethod
 
-from sqlalchemy import MetaData, create_engine
+from sqlalchemy import MetaData, create_engine, event
 from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.orm import create_session
 
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.tasks import BaseTask
 from cumulusci.tasks.bulkdata.mapping_parser import parse_from_yaml
+from cumulusci.utils.iterators import iterate_in_chunks
 
 from .utils import create_table
 
@@ -20,6 +21,9 @@ class BaseGenerateDataTask(BaseTask, metaclass=ABCMeta):
     Use the `mapping` option to specify a mapping file.
     """
 
+    # parsed mapping files, keyed by (path, mtime)
+    _MAPPING_CACHE = {}
+
     task_options = {
         "num_records": {
             "description": "How many records to generate: total number of opportunities.",
@@ -73,11 +77,18 @@ class BaseGenerateDataTask(BaseTask, metaclass=ABCMeta):
         if not mapping_file_path:
             raise TaskOptionsError("Mapping file path required")
 
-        return parse_from_yaml(mapping_file_path)
+        key = (mapping_file_path, os.stat(mapping_file_path).st_mtime)
+        mappings = self._MAPPING_CACHE.get(key)
+        if mappings is None:
+            mappings = self._MAPPING_CACHE[key] = parse_from_yaml(mapping_file_path)
+        return mappings
 
     @staticmethod
     def init_db(db_url, mappings):
         engine = create_engine(db_url)
+        if engine.dialect.name == "sqlite":
+            # The generated database is scratch space, so skip fsyncs
+            event.listen(engine, "connect", _set_sqlite_scratch_pragmas)
         metadata = MetaData()
         metadata.bind = engine
         if mappings:
@@ -85,12 +96,33 @@ class BaseGenerateDataTask(BaseTask, metaclass=ABCMeta):
                 if "table" in mapping and mapping["table"] not in metadata.tables:
                     create_table(mapping, metadata)
         metadata.create_all()
-        base = automap_base(bind=engine, metadata=metadata)
-        base.prepare(engine, reflect=True)
+        # map the tables we just defined rather than reflecting them back
+        base = automap_base(metadata=metadata)
+        base.prepare()
         session = create_session(bind=engine, autocommit=False)
         return session, engine, base
 
+    @staticmethod
+    def bulk_insert(session, mapped_class, rows, chunk_size=10000):
+        """Insert an iterable of row dicts for `mapped_class` in chunks
+        of multi-row INSERTs rather than one ORM object at a time.
+
+        The session is committed by _generate_data once generate_data
+        returns."""
+        for chunk in iterate_in_chunks(chunk_size, rows):
+            session.bulk_insert_mappings(mapped_class, chunk)
+
     @abstractmethod
     def generate_data(self, session, engine, base, num_records, current_batch_num):
         """Abstract methods for base classes to really generate
-        the data into an open session."""
+        the data into an open session.
+
+        For large volumes, yield plain dicts and pass them to
+        bulk_insert() instead of adding ORM instances to the session."""
+
+
+def _set_sqlite_scratch_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.close()
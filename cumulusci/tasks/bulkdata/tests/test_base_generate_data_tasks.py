@@ -1,9 +1,10 @@
 import os
 from unittest import mock
 
-from sqlalchemy import Unicode
+from sqlalchemy import Unicode, create_engine, text
 
 from cumulusci.tasks.bulkdata.base_generate_data_task import BaseGenerateDataTask
+from cumulusci.tasks.bulkdata.mapping_parser import parse_from_yaml
 from cumulusci.tasks.bulkdata.tests.utils import _make_task
 from cumulusci.utils import temporary_dir
 
@@ -26,6 +27,14 @@ class DummyBaseBatchDataTask(BaseGenerateDataTask):
         DummyBaseBatchDataTask.was_called = True
 
 
+class BulkInsertDataTask(BaseGenerateDataTask):
+    """Inserts plain dicts via bulk_insert."""
+
+    def generate_data(self, session, engine, base, num_records, current_batch_num):
+        rows = ({"name": f"Household {i}"} for i in range(num_records))
+        self.bulk_insert(session, base.classes["households"], rows, chunk_size=7)
+
+
 class TestBaseBatchDataTask:
     def test_BaseBatchDataTask(self):
         mapping_file = os.path.join(os.path.dirname(__file__), "mapping_v2.yml")
@@ -59,3 +68,60 @@ class TestBaseBatchDataTask:
             gen_data.assert_called_once_with(
                 "sqlite:///generated_data.db", mock.ANY, 20, 0
             )
+
+    def test_bulk_insert(self):
+        mapping_file = os.path.join(os.path.dirname(__file__), "mapping_v2.yml")
+        with temporary_dir() as d:
+            dburl = "sqlite:///" + os.path.join(d, "temp.db")
+            task = _make_task(
+                BulkInsertDataTask,
+                {
+                    "options": {
+                        "num_records": NUM_RECORDS,
+                        "mapping": mapping_file,
+                        "database_url": dburl,
+                    }
+                },
+            )
+            task()
+            engine = create_engine(dburl)
+            with engine.connect() as conn:
+                names = [
+                    row[0] for row in conn.execute(text("select name from households"))
+                ]
+            engine.dispose()
+        assert names == [f"Household {i}" for i in range(NUM_RECORDS)]
+
+    def test_init_db__sqlite_pragmas(self):
+        with temporary_dir() as d:
+            dburl = "sqlite:///" + os.path.join(d, "temp.db")
+            session, engine, base = BaseGenerateDataTask.init_db(dburl, None)
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 0
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "memory"
+            engine.dispose()
+
+    def test_read_mappings__cached(self):
+        mapping_file = os.path.join(os.path.dirname(__file__), "mapping_v2.yml")
+        task = _make_task(
+            DummyBaseBatchDataTask,
+            {"options": {"num_records": NUM_RECORDS, "mapping": mapping_file}},
+        )
+        with mock.patch.dict(
+            BaseGenerateDataTask._MAPPING_CACHE, clear=True
+        ), mock.patch(
+            "cumulusci.tasks.bulkdata.base_generate_data_task.parse_from_yaml",
+            wraps=parse_from_yaml,
+        ) as parse:
+            first = task._read_mappings(mapping_file)
+            second = task._read_mappings(mapping_file)
+        assert first is second
+        parse.assert_called_once_with(mapping_file)
+
+    def test_init_db__does_not_reflect(self):
+        mapping_file = os.path.join(os.path.dirname(__file__), "mapping_v2.yml")
+        mappings = parse_from_yaml(mapping_file)
+        with mock.patch("sqlalchemy.MetaData.reflect") as reflect:
+            session, engine, base = BaseGenerateDataTask.init_db("sqlite://", mappings)
+        reflect.assert_not_called()
+        assert set(base.classes.keys()) == {"households", "contacts"}
@@ -1,6 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+
+from simple_salesforce import format_soql
+from simple_salesforce.exceptions import SalesforceError
+
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.core.utils import process_list_arg
 from cumulusci.tasks.salesforce import BaseSalesforceApiTask
+from cumulusci.utils.iterators import iterate_in_chunks
 
 
 class ActivateFlow(BaseSalesforceApiTask):
@@ -8,6 +15,11 @@ class ActivateFlow(BaseSalesforceApiTask):
     Activate the Flows with the supplied Developer Names
     """
 
+    # PATCH requests to issue concurrently over the pooled API session
+    max_workers = 8
+    # DeveloperNames per SOQL IN clause
+    query_chunk_size = 200
+
     task_options = {
         "developer_names": {
             "description": "List of DeveloperNames to query in SOQL",
@@ -31,24 +43,32 @@ class ActivateFlow(BaseSalesforceApiTask):
             f"Activating the following Flows: {self.options['developer_names']}"
         )
         self.logger.info("Querying flow definitions...")
-        result = self.tooling.query(
-            "SELECT Id, ActiveVersion.VersionNumber, LatestVersion.VersionNumber, DeveloperName FROM FlowDefinition WHERE DeveloperName IN ({0})".format(
-                ",".join([f"'{n}'" for n in self.options["developer_names"]])
-            )
-        )
+        names = self.options["developer_names"]
         results = []
-        for listed_flow in result["records"]:
-            results.append(listed_flow["DeveloperName"])
-            self.logger.info(f'Processing: {listed_flow["DeveloperName"]}')
-            path = f"tooling/sobjects/FlowDefinition/{listed_flow['Id']}"
-            urlpath = self.sf.base_url + path
-            data = {
-                "Metadata": {
-                    "activeVersionNumber": listed_flow["LatestVersion"]["VersionNumber"]
-                }
-            }
-            response = self.tooling._call_salesforce("PATCH", urlpath, json=data)
-            self.logger.info(response)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            records = chain.from_iterable(
+                executor.map(
+                    self._query_flow_definitions,
+                    iterate_in_chunks(self.query_chunk_size, names),
+                )
+            )
+            futures = {}
+            for listed_flow in records:
+                results.append(listed_flow["DeveloperName"])
+                self.logger.info(f'Processing: {listed_flow["DeveloperName"]}')
+                future = executor.submit(self._activate_flow, listed_flow)
+                futures[future] = listed_flow["DeveloperName"]
+            errors = []
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except SalesforceError as e:
+                    self.logger.error(f"Failed to activate {futures[future]}: {e}")
+                    errors.append(e)
+                else:
+                    self.logger.debug(response)
+        if errors:
+            raise errors[0]
         excluded = []
         for i in self.options["developer_names"]:
             if i not in results:
@@ -57,3 +77,22 @@ class ActivateFlow(BaseSalesforceApiTask):
             self.logger.warning(
                 f"The following developer names were not found: {excluded}"
             )
+
+    def _query_flow_definitions(self, names):
+        result = self.tooling.query(
+            format_soql(
+                "SELECT Id, ActiveVersion.VersionNumber, LatestVersion.VersionNumber, DeveloperName FROM FlowDefinition WHERE DeveloperName IN {names}",
+                names=list(names),
+            )
+        )
+        return result["records"]
+
+    def _activate_flow(self, listed_flow):
+        path = f"tooling/sobjects/FlowDefinition/{listed_flow['Id']}"
+        urlpath = self.sf.base_url + path
+        data = {
+            "Metadata": {
+                "activeVersionNumber": listed_flow["LatestVersion"]["VersionNumber"]
+            }
+        }
+        return self.tooling._call_salesforce("PATCH", urlpath, json=data)
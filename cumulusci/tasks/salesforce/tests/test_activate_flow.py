@@ -1,7 +1,10 @@
 import json
+import re
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import responses
+from simple_salesforce.exceptions import SalesforceMalformedRequest
 
 from cumulusci.core.exceptions import TaskOptionsError
 from cumulusci.tasks.salesforce.activate_flow import ActivateFlow
@@ -99,6 +102,64 @@ class TestActivateFlow:
         cc_task()
         assert 3 == len(responses.calls)
 
+    @responses.activate
+    def test_activate_flow_processes__patch_error(self, caplog):
+        cc_task = create_task(ActivateFlow, {"developer_names": ["ape"]})
+        record_id = "3001F0000009GFwQAW"
+        activate_url = (
+            "{}/services/data/v43.0/tooling/sobjects/FlowDefinition/{}".format(
+                cc_task.org_config.instance_url, record_id
+            )
+        )
+        responses.add(
+            method="GET",
+            url="https://test.salesforce.com/services/data/v43.0/tooling/query/?q=SELECT+Id%2C+ActiveVersion.VersionNumber%2C+LatestVersion.VersionNumber%2C+DeveloperName+FROM+FlowDefinition+WHERE+DeveloperName+IN+%28%27ape%27%29",
+            body=json.dumps(
+                {
+                    "records": [
+                        {
+                            "Id": record_id,
+                            "DeveloperName": "ape",
+                            "LatestVersion": {"VersionNumber": 1},
+                        }
+                    ]
+                }
+            ),
+            status=200,
+        )
+        responses.add(
+            method=responses.PATCH,
+            url=activate_url,
+            status=400,
+            json=[{"errorCode": "FIELD_INTEGRITY_EXCEPTION", "message": "Nope"}],
+        )
+        with pytest.raises(SalesforceMalformedRequest):
+            cc_task()
+        assert "Failed to activate ape" in caplog.text
+
+    @responses.activate
+    def test_activate_flow_processes__chunked_and_escaped(self):
+        cc_task = create_task(ActivateFlow, {"developer_names": ["ape", "o'brien"]})
+        cc_task.query_chunk_size = 1
+        responses.add(
+            method="GET",
+            url=re.compile(
+                r"https://test.salesforce.com/services/data/v43.0/tooling/query/.*"
+            ),
+            json={"records": []},
+            status=200,
+        )
+
+        cc_task()
+        queries = sorted(
+            parse_qs(urlparse(call.request.url).query)["q"][0]
+            for call in responses.calls
+        )
+        assert [q.split("WHERE ")[1] for q in queries] == [
+            "DeveloperName IN ('ape')",
+            "DeveloperName IN ('o\\'brien')",
+        ]
+
     @responses.activate
     def test_activate_no_flow_processes(self):
         with pytest.raises(TaskOptionsError):
@@ -10,6 +10,12 @@ from yaml.error import MarkedYAMLError
 from cumulusci.core.exceptions import YAMLParseException
 from cumulusci.utils.fileutils import FSResource, load_from_source
 
+try:
+    # libyaml's C parser is much faster when it is available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
+
 NBSP = "\u00A0"
 
 pattern = re.compile(r"^\s*[\u00A0]+\s*", re.MULTILINE)
@@ -57,7 +63,7 @@ def load_yaml_data(
         context = context or filename
         data = _replace_nbsp(f_config.read(), context)
         try:
-            rc = yaml.safe_load(StringIO(data))
+            rc = yaml.load(StringIO(data), Loader=SafeLoader)
         except MarkedYAMLError as e:
             line_num = e.problem_mark.line + 1
             column_num = e.problem_mark.column
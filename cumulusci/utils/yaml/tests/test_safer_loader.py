@@ -77,10 +77,10 @@ def test_generic_exception__with_name_attr(safe_load, incorrect_yaml_file):
         load_yaml_data(incorrect_yaml_file)
 
 
-@patch("cumulusci.utils.yaml.safer_loader.yaml.safe_load")
-def test_generic_exception__without_name_attr(safe_load):
+@patch("cumulusci.utils.yaml.safer_loader.yaml.load")
+def test_generic_exception__without_name_attr(load):
     invalid_yaml = """xyz: abc   \n>>>\nefg: lmn\n"""
-    safe_load.side_effect = Exception("generic")
+    load.side_effect = Exception("generic")
     with pytest.raises(
         YAMLParseException,
         match="An error occurred parsing a yaml file.\nError message: generic",